@@ -1,8 +1,10 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+from student_data_core import DATA_PATH, SUBJECTS, get_df, to_csv_bytes
+
 # =========================
 # CONFIG
 # =========================
@@ -15,46 +17,165 @@ st.set_page_config(
 # =========================
 # LOAD DATA
 # =========================
-DATA_PATH = "data/student_data2.csv"
-df = pd.read_csv(DATA_PATH)
-subjects = ["Math", "Science", "English"]
-
-df["Average_Score"] = df[subjects].mean(axis=1)
-
-def grade(score):
-    if score >= 90: return "A"
-    if score >= 80: return "B"
-    if score >= 70: return "C"
-    return "D"
+subjects = SUBJECTS
 
-df["Grade"] = df["Average_Score"].apply(grade)
+@st.cache_data
+def filter_students(grades, attendance):
+    df = get_df(DATA_PATH)
+    # Compare int8 category codes instead of hashing strings per row
+    grade_codes = df["Grade"].cat.categories.get_indexer(list(grades))
+    att_codes = df["Attendance_Level"].cat.categories.get_indexer(list(attendance))
+    mask = (
+        np.isin(df["Grade"].cat.codes.to_numpy(), grade_codes)
+        & np.isin(df["Attendance_Level"].cat.codes.to_numpy(), att_codes)
+    )
+    return df[mask]
 
-df["Attendance_Level"] = pd.cut(
-    df["Attendance"],
-    bins=[0, 80, 90, 100],
-    labels=["Low", "Medium", "High"]
-)
+df = get_df(DATA_PATH)
 
-# Color coding for bars
+# Color coding for bars (applied via color_discrete_map on each figure)
 grade_colors = {"A":"#2ECC71", "B":"#F1C40F", "C":"#E67E22", "D":"#E74C3C"}
-df["Color"] = df["Grade"].map(grade_colors)
 
 # =========================
 # SIDEBAR FILTERS
 # =========================
 st.sidebar.header("🎛 Filter Students")
 subject = st.sidebar.selectbox("Subject to Analyze", subjects + ["Average_Score"])
-grades = st.sidebar.multiselect("Select Grades", df["Grade"].unique(), df["Grade"].unique())
-attendance = st.sidebar.multiselect(
-    "Attendance Level",
-    df["Attendance_Level"].unique(),
-    df["Attendance_Level"].unique()
-)
+
+# cat.categories is a stored attribute — no O(N) unique() pass per rerun
+grade_choices = list(df["Grade"].cat.categories)
+att_choices = list(df["Attendance_Level"].cat.categories)
+
+grades = st.sidebar.multiselect("Select Grades", grade_choices, grade_choices)
+attendance = st.sidebar.multiselect("Attendance Level", att_choices, att_choices)
 
 if st.sidebar.button("🔄 Reset Filters"):
-    st.experimental_rerun()
+    st.rerun()
 
-filtered = df[df["Grade"].isin(grades) & df["Attendance_Level"].isin(attendance)]
+filter_key = (tuple(grades), tuple(attendance))
+filtered = filter_students(*filter_key)
+
+# =========================
+# FIGURE BUILDERS
+# =========================
+# Streamlit reruns the whole script on any widget change; caching each
+# figure on the filter selection means unchanged tabs return their
+# already-built figures instead of reconstructing them every rerun.
+
+@st.cache_data
+def build_hist(grades, attendance, subject):
+    filtered = filter_students(grades, attendance)
+    # Pre-bin server-side: the browser receives ~20 bars instead of
+    # every row plus client-side binning.
+    counts, edges = np.histogram(filtered[subject].to_numpy(), bins=20, range=(0, 100))
+    fig = px.bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts,
+        labels={"x": subject, "y": "Students"},
+        title=f"{subject} Distribution"
+    )
+    fig.update_layout(template="plotly_white", dragmode="zoom", bargap=0)
+    return fig
+
+@st.cache_data
+def build_pie(grades, attendance):
+    filtered = filter_students(grades, attendance)
+    grade_counts = filtered["Grade"].value_counts()
+    fig = px.pie(
+        names=grade_counts.index, values=grade_counts.values,
+        title="Grade Distribution", hole=0.4,
+        color=grade_counts.index, color_discrete_map=grade_colors
+    )
+    fig.update_traces(textinfo="percent+label")
+    return fig
+
+@st.cache_data
+def build_scatter(grades, attendance):
+    filtered = filter_students(grades, attendance)
+    fig = px.scatter(
+        filtered, x="Attendance", y="Average_Score", color="Grade",
+        size="Average_Score", hover_name="Name",
+        labels={"Attendance":"Attendance %"}, title="Attendance vs Average Score",
+        color_discrete_map=grade_colors,
+        render_mode="webgl"  # scattergl: GPU draw calls instead of SVG DOM nodes
+    )
+    fig.update_layout(template="plotly_white", dragmode="zoom")
+    return fig
+
+@st.cache_data
+def rasterize_scatter(grades, attendance):
+    # Past ~50K points even WebGL overplots; rasterize server-side into a
+    # fixed-size image so the browser payload stops growing with N.
+    import datashader as ds
+    import datashader.transfer_functions as tf
+
+    filtered = filter_students(grades, attendance)
+    cvs = ds.Canvas(plot_width=600, plot_height=400, x_range=(0, 100), y_range=(0, 100))
+    agg = cvs.points(filtered, "Attendance", "Average_Score", ds.count_cat("Grade"))
+    return tf.shade(agg).to_pil()
+
+@st.cache_data
+def build_top_bottom(grades, attendance):
+    filtered = filter_students(grades, attendance)
+    top10 = filtered.nlargest(10, "Average_Score")
+    bottom10 = filtered.nsmallest(10, "Average_Score")
+
+    # Pre-format bar labels server-side so Plotly ships short strings
+    # instead of formatting float64 values in the browser
+    top_text = np.round(top10["Average_Score"].to_numpy(), 1).astype(str).tolist()
+    bottom_text = np.round(bottom10["Average_Score"].to_numpy(), 1).astype(str).tolist()
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=top10["Name"], y=top10["Average_Score"],
+        name="Top 10", marker_color="#2ECC71", text=top_text, textposition="auto",
+        hovertemplate="%{x}: %{y:.1f}<extra>Top 10</extra>"
+    ))
+    fig.add_trace(go.Bar(
+        x=bottom10["Name"], y=bottom10["Average_Score"],
+        name="Bottom 10", marker_color="#E74C3C", text=bottom_text, textposition="auto",
+        hovertemplate="%{x}: %{y:.1f}<extra>Bottom 10</extra>"
+    ))
+    fig.update_layout(title="Top & Bottom 10 Students", template="plotly_white", barmode="group")
+    return fig
+
+@st.cache_data
+def build_corr(grades, attendance):
+    filtered = filter_students(grades, attendance)
+    # Single BLAS-backed corrcoef over a contiguous float32 block instead
+    # of pandas' per-pair NaN-aware path
+    cols = subjects + ["Attendance"]
+    corr = np.corrcoef(filtered[cols].to_numpy(dtype=np.float32, copy=False), rowvar=False)
+    fig = px.imshow(
+        corr, x=cols, y=cols,
+        text_auto=".2f", color_continuous_scale="RdBu_r",
+        title="Correlation Heatmap"
+    )
+    fig.update_layout(template="plotly_white")
+    return fig
+
+@st.cache_data
+def build_grade_trend(grades, attendance):
+    filtered = filter_students(grades, attendance)
+    # On an ordered Categorical, sort=False already yields category order
+    # (D..A) straight from a bincount of the codes — no object sort needed.
+    grade_counts = filtered["Grade"].value_counts(sort=False)
+    fig = px.bar(
+        x=grade_counts.index, y=grade_counts.values,
+        labels={"x":"Grade", "y":"Number of Students"},
+        title="Number of Students per Grade",
+        color=grade_counts.index.map(grade_colors)
+    )
+    fig.update_layout(template="plotly_white")
+    return fig
+
+@st.cache_data
+def build_box(grades, attendance, subj):
+    filtered = filter_students(grades, attendance)
+    fig = px.box(
+        filtered, y=subj, color="Grade", color_discrete_map=grade_colors,
+        title=f"{subj} Score Distribution", points="all"
+    )
+    return fig
 
 # =========================
 # KPI METRICS
@@ -79,116 +200,84 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📚 Subject Insights"
 ])
 
+# Each tab renders inside an st.fragment, so interactions within a tab
+# rerun only that tab's body instead of rebuilding all five tabs.
+
 # =========================
 # OVERVIEW TAB
 # =========================
-with tab1:
+@st.fragment
+def render_overview():
     st.subheader("Distribution of Students by Scores & Grades")
     col1, col2 = st.columns(2)
+    col1.plotly_chart(build_hist(*filter_key, subject), use_container_width=True)
+    col2.plotly_chart(build_pie(*filter_key), use_container_width=True)
 
-    fig_hist = px.histogram(
-        filtered, x=subject, nbins=20,
-        color="Grade", color_discrete_map=grade_colors,
-        hover_data=["Name", "Grade"], labels={subject:subject},
-        title=f"{subject} Distribution"
-    )
-    fig_hist.update_layout(template="plotly_white", dragmode="zoom")
-    col1.plotly_chart(fig_hist, use_container_width=True)
-
-    fig_pie = px.pie(
-        filtered, names="Grade", values="Average_Score",
-        title="Grade Distribution", hole=0.4,
-        color="Grade", color_discrete_map=grade_colors
-    )
-    fig_pie.update_traces(textinfo="percent+label")
-    col2.plotly_chart(fig_pie, use_container_width=True)
+with tab1:
+    render_overview()
 
 # =========================
 # PERFORMANCE ANALYSIS TAB
 # =========================
-with tab2:
+@st.fragment
+def render_performance():
     st.subheader("Attendance vs Performance & Top/Bottom Students")
     col1, col2 = st.columns(2)
+    if len(filtered) > 50_000:
+        col1.image(rasterize_scatter(*filter_key), caption="Attendance vs Average Score")
+    else:
+        col1.plotly_chart(build_scatter(*filter_key), use_container_width=True)
+    col2.plotly_chart(build_top_bottom(*filter_key), use_container_width=True)
 
-    # Scatter plot
-    fig_scatter = px.scatter(
-        filtered, x="Attendance", y="Average_Score", color="Grade",
-        size="Average_Score", hover_name="Name",
-        labels={"Attendance":"Attendance %"}, title="Attendance vs Average Score",
-        color_discrete_map=grade_colors
-    )
-    fig_scatter.update_layout(template="plotly_white", dragmode="zoom")
-    col1.plotly_chart(fig_scatter, use_container_width=True)
-
-    # Top & Bottom 10 students
-    top10 = filtered.sort_values("Average_Score", ascending=False).head(10)
-    bottom10 = filtered.sort_values("Average_Score", ascending=True).head(10)
-
-    fig_bar = go.Figure()
-    fig_bar.add_trace(go.Bar(
-        x=top10["Name"], y=top10["Average_Score"],
-        name="Top 10", marker_color="#2ECC71", text=top10["Average_Score"], textposition="auto"
-    ))
-    fig_bar.add_trace(go.Bar(
-        x=bottom10["Name"], y=bottom10["Average_Score"],
-        name="Bottom 10", marker_color="#E74C3C", text=bottom10["Average_Score"], textposition="auto"
-    ))
-    fig_bar.update_layout(title="Top & Bottom 10 Students", template="plotly_white", barmode="group")
-    col2.plotly_chart(fig_bar, use_container_width=True)
+with tab2:
+    render_performance()
 
 # =========================
 # CORRELATION TAB
 # =========================
-with tab3:
+@st.fragment
+def render_correlation():
     st.subheader("Correlation Heatmap")
-    corr = filtered[subjects + ["Attendance"]].corr()
-    fig_corr = px.imshow(
-        corr, text_auto=".2f", color_continuous_scale="RdBu_r",
-        title="Correlation Heatmap"
-    )
-    fig_corr.update_layout(template="plotly_white")
-    st.plotly_chart(fig_corr, use_container_width=True)
+    st.plotly_chart(build_corr(*filter_key), use_container_width=True)
+
+with tab3:
+    render_correlation()
 
 # =========================
 # GRADE TRENDS TAB
 # =========================
-with tab4:
+@st.fragment
+def render_grade_trends():
     st.subheader("Grade Trends")
-    grade_counts = filtered["Grade"].value_counts().sort_index()
-    fig_grade = px.bar(
-        x=grade_counts.index, y=grade_counts.values,
-        labels={"x":"Grade", "y":"Number of Students"},
-        title="Number of Students per Grade",
-        color=grade_counts.index.map(grade_colors)
-    )
-    fig_grade.update_layout(template="plotly_white")
-    st.plotly_chart(fig_grade, use_container_width=True)
+    st.plotly_chart(build_grade_trend(*filter_key), use_container_width=True)
+
+with tab4:
+    render_grade_trends()
 
 # =========================
 # SUBJECT INSIGHTS TAB
 # =========================
-with tab5:
+@st.fragment
+def render_subject_insights():
     st.subheader("Subject Score Distributions")
-    col1, col2, col3 = st.columns(3)
+    cols = st.columns(3)
+
+    for col, subj in zip(cols, subjects):
+        col.plotly_chart(build_box(*filter_key, subj), use_container_width=True)
 
-    for i, subj in enumerate(subjects):
-        fig_box = px.box(
-            filtered, y=subj, color="Grade", color_discrete_map=grade_colors,
-            title=f"{subj} Score Distribution", points="all"
-        )
-        if i == 0:
-            col1.plotly_chart(fig_box, use_container_width=True)
-        elif i == 1:
-            col2.plotly_chart(fig_box, use_container_width=True)
-        else:
-            col3.plotly_chart(fig_box, use_container_width=True)
+with tab5:
+    render_subject_insights()
 
 # =========================
 # DATA TABLE & DOWNLOAD
 # =========================
 with st.expander("📄 View & Download Filtered Data"):
     st.dataframe(filtered, use_container_width=True)
-    csv = filtered.to_csv(index=False).encode("utf-8")
-    st.download_button("📥 Download CSV", data=csv, file_name="filtered_students.csv", mime="text/csv")
+    st.download_button(
+        "📥 Download CSV",
+        data=to_csv_bytes(filtered),
+        file_name="filtered_students.csv",
+        mime="text/csv"
+    )
 
 st.success("✅ Dashboard fully interactive & data-scientist ready!")
@@ -1,11 +1,12 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import numpy as np
 import warnings
 
+from student_data_core import SUBJECTS, get_df, to_csv_bytes
+
 # =========================
 # STREAMLIT CONFIG (MUST BE FIRST)
 # =========================
@@ -32,40 +33,8 @@ sns.set_style("whitegrid")
 # =========================
 # LOAD DATA
 # =========================
-@st.cache_data
-def load_data():
-    if not os.path.exists(DATA_PATH):
-        st.error(f"❌ File not found: {DATA_PATH}")
-        st.stop()
-
-    df = pd.read_csv(DATA_PATH)
-
-    subjects = ['Math', 'Science', 'English']
-    df['Average_Score'] = df[subjects].mean(axis=1)
-
-    def assign_grade(score):
-        if score >= 90:
-            return 'A'
-        elif score >= 80:
-            return 'B'
-        elif score >= 70:
-            return 'C'
-        else:
-            return 'D'
-
-    df['Grade'] = df['Average_Score'].apply(assign_grade)
-
-    df['Attendance_Level'] = pd.cut(
-        df['Attendance'].clip(0, 100),
-        bins=[0, 80, 90, 100],
-        labels=['Low', 'Medium', 'High'],
-        include_lowest=True
-    )
-
-    return df
-
-df = load_data()
-subjects = ['Math', 'Science', 'English']
+df = get_df(DATA_PATH)
+subjects = list(SUBJECTS)
 
 # =========================
 # TITLE
@@ -83,21 +52,28 @@ selected_subject = st.sidebar.selectbox(
     subjects + ["Average_Score"]
 )
 
+# cat.categories is a stored attribute — no O(N) unique()+sort per rerun
+grade_choices = list(df['Grade'].cat.categories)
+att_choices = list(df['Attendance_Level'].cat.categories)
+
 selected_grades = st.sidebar.multiselect(
     "Select Grades",
-    sorted(df['Grade'].unique()),
-    default=sorted(df['Grade'].unique())
+    grade_choices,
+    default=grade_choices
 )
 
 selected_attendance = st.sidebar.multiselect(
     "Attendance Level",
-    df['Attendance_Level'].cat.categories,
-    default=df['Attendance_Level'].cat.categories
+    att_choices,
+    default=att_choices
 )
 
+# Codes-level filtering on the two Categorical columns
 filtered_df = df[
-    (df['Grade'].isin(selected_grades)) &
-    (df['Attendance_Level'].isin(selected_attendance))
+    np.isin(df['Grade'].cat.codes.to_numpy(),
+            df['Grade'].cat.categories.get_indexer(selected_grades)) &
+    np.isin(df['Attendance_Level'].cat.codes.to_numpy(),
+            df['Attendance_Level'].cat.categories.get_indexer(selected_attendance))
 ]
 
 if filtered_df.empty:
@@ -123,7 +99,7 @@ st.dataframe(filtered_df, use_container_width=True)
 # Download
 st.download_button(
     "📥 Download CSV",
-    filtered_df.to_csv(index=False).encode("utf-8"),
+    to_csv_bytes(filtered_df),
     "filtered_students.csv",
     "text/csv"
 )
@@ -134,6 +110,16 @@ st.download_button(
 st.markdown("---")
 st.header("📊 Visual Analysis")
 
+# Saving PNGs is pure CPU (Agg render + compression) repeated on every
+# rerun. Cache on the filter selection so a plot is only re-saved when
+# the data behind it changed, and render at screen dpi rather than 300.
+@st.cache_data
+def save_png(fig_key, _fig, path, dpi=100):
+    _fig.savefig(path, dpi=dpi)
+    return path
+
+filter_key = (selected_subject, tuple(selected_grades), tuple(selected_attendance))
+
 # Histogram
 fig, ax = plt.subplots(figsize=(8, 5))
 ax.hist(filtered_df[selected_subject], bins=10, edgecolor="black")
@@ -141,7 +127,7 @@ ax.set_title(f"{selected_subject} Score Distribution")
 ax.set_xlabel("Score")
 ax.set_ylabel("Students")
 st.pyplot(fig)
-fig.savefig(os.path.join(PLOTS_DIR, f"hist_{selected_subject}.png"), dpi=300)
+save_png((*filter_key, "hist"), fig, os.path.join(PLOTS_DIR, f"hist_{selected_subject}.png"))
 plt.close()
 
 # Box Plot
@@ -149,7 +135,7 @@ fig, ax = plt.subplots(figsize=(6, 4))
 sns.boxplot(y=filtered_df[selected_subject], ax=ax)
 ax.set_title(f"{selected_subject} Boxplot")
 st.pyplot(fig)
-fig.savefig(os.path.join(PLOTS_DIR, f"box_{selected_subject}.png"), dpi=300)
+save_png((*filter_key, "box"), fig, os.path.join(PLOTS_DIR, f"box_{selected_subject}.png"))
 plt.close()
 
 # Scatter Plot
@@ -164,7 +150,7 @@ sns.scatterplot(
 )
 ax.set_title("Attendance vs Average Score")
 st.pyplot(fig)
-fig.savefig(os.path.join(PLOTS_DIR, "scatter_attendance.png"), dpi=300)
+save_png((*filter_key, "scatter"), fig, os.path.join(PLOTS_DIR, "scatter_attendance.png"))
 plt.close()
 
 # Violin Plot
@@ -172,21 +158,25 @@ fig, ax = plt.subplots(figsize=(8, 5))
 sns.violinplot(data=filtered_df[subjects], ax=ax)
 ax.set_title("Subject-wise Score Distribution")
 st.pyplot(fig)
-fig.savefig(os.path.join(PLOTS_DIR, "violin_subjects.png"), dpi=300)
+save_png((*filter_key, "violin"), fig, os.path.join(PLOTS_DIR, "violin_subjects.png"))
 plt.close()
 
 # Heatmap
+corr_cols = subjects + ['Attendance']
+corr = np.corrcoef(filtered_df[corr_cols].to_numpy(dtype=np.float32, copy=False), rowvar=False)
 fig, ax = plt.subplots(figsize=(6, 5))
 sns.heatmap(
-    filtered_df[subjects + ['Attendance']].corr(),
+    corr,
     annot=True,
     cmap="coolwarm",
     fmt=".2f",
+    xticklabels=corr_cols,
+    yticklabels=corr_cols,
     ax=ax
 )
 ax.set_title("Correlation Heatmap")
 st.pyplot(fig)
-fig.savefig(os.path.join(PLOTS_DIR, "heatmap.png"), dpi=300)
+save_png((*filter_key, "heatmap"), fig, os.path.join(PLOTS_DIR, "heatmap.png"))
 plt.close()
 
 # =========================
@@ -0,0 +1,21 @@
+"""One-shot conversion of the student CSV to Parquet.
+
+Run once after updating data/student_data2.csv:
+
+    python convert.py
+
+Both dashboards prefer the Parquet copy when it exists: the binary
+columnar format skips CSV tokenization on load and stores the narrow
+dtypes, so downstream steps inherit them for free.
+"""
+
+import pandas as pd
+
+from student_data_core import CSV_DTYPES, DATA_PATH
+
+PARQUET_PATH = DATA_PATH.rsplit(".", 1)[0] + ".parquet"
+
+if __name__ == "__main__":
+    df = pd.read_csv(DATA_PATH, dtype=CSV_DTYPES)
+    df.to_parquet(PARQUET_PATH, index=False)
+    print(f"✅ Wrote {len(df)} rows to {PARQUET_PATH}")
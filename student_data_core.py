@@ -0,0 +1,116 @@
+import io
+import os
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import numexpr as ne
+import pyarrow as pa
+import pyarrow.csv
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# =========================
+# SHARED DATA LOADING
+# =========================
+# Both dashboards (Student_data.py and Student_data_backup.py) need the same
+# CSV load and derived columns. Keeping the load here, behind st.cache_data,
+# guarantees one parse and one prepared DataFrame per dataset version no
+# matter which UI (or both) runs in the session.
+
+DATA_PATH = "data/student_data2.csv"
+SUBJECTS = ["Math", "Science", "English"]
+
+# Scores and attendance fit in a byte; reading them as int8 cuts the memory
+# every downstream reduction has to touch by 8x.
+CSV_DTYPES = {
+    "Math": np.int8,
+    "Science": np.int8,
+    "English": np.int8,
+    "Attendance": np.int8,
+    "Name": "string[pyarrow]",
+}
+
+
+# numexpr handles the current 3-subject derivation well, but its nested
+# where() expressions re-stream per nesting level. Once the subject list
+# grows wide, a single jitted pass that averages and bins each row while
+# it is still in cache wins; get_df() switches over automatically.
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _avg_and_grade(scores):
+        n, k = scores.shape
+        avg = np.empty(n, np.float32)
+        code = np.empty(n, np.int8)
+        inv = np.float32(1.0 / k)
+        for i in prange(n):
+            s = np.float32(0.0)
+            for j in range(k):
+                s += scores[i, j]
+            a = s * inv
+            avg[i] = a
+            code[i] = 3 if a >= 90 else 2 if a >= 80 else 1 if a >= 70 else 0
+        return avg, code
+
+
+@st.cache_data
+def get_df(path=DATA_PATH):
+    # Prefer the Parquet copy written by convert.py: columnar binary with
+    # stored dtypes, so the load skips CSV tokenization and type inference.
+    parquet_path = os.path.splitext(path)[0] + ".parquet"
+    if os.path.exists(parquet_path):
+        df = pd.read_parquet(parquet_path)
+        # Parquet copies written before convert.py learned the narrow
+        # dtypes come back as int64/object; normalize them once here.
+        if df["Name"].dtype != "string[pyarrow]":
+            df = df.astype(CSV_DTYPES)
+    else:
+        if not os.path.exists(path):
+            st.error(f"❌ File not found: {path}")
+            st.stop()
+        df = pd.read_csv(path, dtype=CSV_DTYPES)
+
+    if HAS_NUMBA and len(SUBJECTS) > 4:
+        # Wide subject list: one fused row-parallel pass for avg + bin
+        scores = np.ascontiguousarray(df[SUBJECTS].to_numpy(dtype=np.float32))
+        avg, grade_codes = _avg_and_grade(scores)
+        df["Average_Score"] = avg
+    else:
+        # Fused average + grade binning via numexpr: streams the three score
+        # columns in cache-sized chunks without materializing intermediates.
+        m = df["Math"].to_numpy()
+        s = df["Science"].to_numpy()
+        e = df["English"].to_numpy()
+        avg = ne.evaluate("(m + s + e) * (1.0 / 3.0)")
+        df["Average_Score"] = avg.astype(np.float32)
+
+        grade_codes = ne.evaluate(
+            "where(avg >= 90, 3, where(avg >= 80, 2, where(avg >= 70, 1, 0)))"
+        ).astype(np.int8)
+    df["Grade"] = pd.Categorical.from_codes(
+        grade_codes, categories=["D", "C", "B", "A"], ordered=True
+    )
+
+    # Clip once on the raw ndarray (no intermediate Series); the -1 lower
+    # edge keeps attendance 0 in the first bin, replacing include_lowest.
+    att = np.clip(df["Attendance"].to_numpy(), 0, 100)
+    df["Attendance_Level"] = pd.cut(
+        att,
+        bins=[-1, 80, 90, 100],
+        labels=["Low", "Medium", "High"],
+    )
+
+    return df
+
+
+@st.cache_data
+def to_csv_bytes(df):
+    # Arrow's threaded C++ CSV writer beats pandas' to_csv, and caching
+    # skips regenerating the download payload while filters are unchanged.
+    buf = io.BytesIO()
+    pa.csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()